@@ -1,13 +1,33 @@
 from flask_restful import Resource
 from flask import jsonify
 from flask import send_file
+from flask import request
 import logging
 from api.energy_calc import get_previous_day_uk, calculate_daily_imbalance, find_highest_imbalance_hour
 from api.data_retrieval import ElexonBrmsFetcher
 from api.report_generation import ReportGenerator
+from api.rate_limiting import RateLimiter, ConcurrencyLimiter, admission_control
+
+# JSON endpoints are cheap, so clients get a generous burst and each endpoint has its own pool
+DAILY_IMBALANCE_LIMITS = admission_control(
+    RateLimiter("daily_imbalance", capacity=30, refill_per_second=1.0),
+    ConcurrencyLimiter("daily_imbalance", max_concurrent=16),
+)
+HIGHEST_IMBALANCE_HOUR_LIMITS = admission_control(
+    RateLimiter("highest_imbalance_hour", capacity=30, refill_per_second=1.0),
+    ConcurrencyLimiter("highest_imbalance_hour", max_concurrent=16),
+)
+
+# Report rendering is CPU heavy, so it gets a small semaphore of its own and a low per-client rate
+ENERGY_REPORT_LIMITS = admission_control(
+    RateLimiter("energy_report", capacity=3, refill_per_second=1 / 20),
+    ConcurrencyLimiter("energy_report", max_concurrent=2, retry_after=5),
+)
 
 
 class DailyImbalance(Resource):
+    method_decorators = [DAILY_IMBALANCE_LIMITS]
+
     def get(self):
         """
         Get the total daily imbalance cost and daily imbalance unit rate for the previous day in UK time.
@@ -40,6 +60,8 @@ class DailyImbalance(Resource):
 
 
 class HighestImbalanceHour(Resource):
+    method_decorators = [HIGHEST_IMBALANCE_HOUR_LIMITS]
+
     def get(self):
         """
         Report which hour had the highest absolute imbalance volumes for the previous day in UK time.
@@ -72,10 +94,14 @@ class HighestImbalanceHour(Resource):
 
 
 class EnergyReport(Resource):
+    method_decorators = [ENERGY_REPORT_LIMITS]
+
     def get(self):
         """
         Generate and return a PDF report with energy data visualizations.
+        Pass ?optimize_size=true for a smaller PDF with lower resolution graphs.
         """
+        optimize_size = request.args.get('optimize_size', 'false').lower() == 'true'
         fetcher = ElexonBrmsFetcher()
         previous_day = get_previous_day_uk()
 
@@ -100,7 +126,8 @@ class EnergyReport(Resource):
                 "highest_imbalance_volume": round(max_volume, 2)
             }
 
-            pdf_buffer = ReportGenerator.create_pdf_report(energy_data, daily_imbalance, highest_imbalance_hour)
+            pdf_buffer = ReportGenerator.create_pdf_report(energy_data, daily_imbalance, highest_imbalance_hour,
+                                                          optimize_size=optimize_size)
 
             logging.info(f"PDF report generated for {previous_day}")
             return send_file(pdf_buffer,
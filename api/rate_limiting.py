@@ -0,0 +1,188 @@
+"""Module for request admission control: per-client rate limiting and per-endpoint concurrency limits."""
+from abc import ABC, abstractmethod
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+import logging
+import math
+import threading
+import time
+from flask import request
+
+
+class RateLimitStore(ABC):
+    """Abstract base class for token bucket stores."""
+
+    @abstractmethod
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """
+        Take one token from the bucket identified by key.
+        This method must be implemented by all subclasses. Stores shared between
+        workers (e.g. backed by Redis) must make the read-refill-take step atomic.
+
+        Args:
+            key (str): The bucket identifier, unique per endpoint and client.
+            capacity (int): The maximum number of tokens the bucket holds.
+            refill_per_second (float): The rate at which tokens are added to the bucket.
+
+        Returns:
+            float: 0.0 if a token was taken, otherwise the seconds until one is available.
+
+        Raises:
+            NotImplementedError: If the method is not implemented by a subclass.
+        """
+        raise NotImplementedError("Subclasses must implement the consume method.")
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    Keeps token buckets in process memory. Limits apply per worker process.
+
+    A bucket that has refilled to capacity behaves exactly like a missing one, so such
+    buckets are swept out every sweep_interval seconds to keep memory bounded by recent clients.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, sweep_interval: float = 60.0):
+        self._clock = clock
+        self._sweep_interval = sweep_interval
+        self._next_sweep = clock() + sweep_interval
+        # key -> (tokens, last refill time, time the bucket is full again)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """
+        Take one token from the in-memory bucket identified by key.
+
+        Args:
+            key (str): The bucket identifier, unique per endpoint and client.
+            capacity (int): The maximum number of tokens the bucket holds.
+            refill_per_second (float): The rate at which tokens are added to the bucket.
+
+        Returns:
+            float: 0.0 if a token was taken, otherwise the seconds until one is available.
+        """
+        with self._lock:
+            now = self._clock()
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            tokens, last_refill, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - last_refill) * refill_per_second)
+
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / refill_per_second
+
+            full_at = now + (capacity - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now, full_at)
+            return retry_after
+
+    def _sweep(self, now: float) -> None:
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+        self._next_sweep = now + self._sweep_interval
+
+
+_store: RateLimitStore = InMemoryRateLimitStore()
+
+
+def get_rate_limit_store() -> RateLimitStore:
+    """
+    Get the store used by all rate limiters.
+    """
+    return _store
+
+
+def set_rate_limit_store(store: RateLimitStore) -> None:
+    """
+    Replace the store used by all rate limiters, e.g. with a shared backend for multi-worker deployments.
+    """
+    global _store
+    _store = store
+
+
+class RateLimiter:
+    """Per-client token bucket rate limit for one endpoint."""
+
+    def __init__(self, name: str, capacity: int, refill_per_second: float):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+
+    def check(self, client_id: str) -> float:
+        """
+        Take a token for the client.
+
+        Returns:
+            float: 0.0 if the request is allowed, otherwise the seconds until the client may retry.
+        """
+        key = f"{self.name}:{client_id}"
+        return get_rate_limit_store().consume(key, self.capacity, self.refill_per_second)
+
+
+class ConcurrencyLimiter:
+    """Caps the number of requests an endpoint serves at the same time within a worker."""
+
+    def __init__(self, name: str, max_concurrent: int, retry_after: int = 1):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+
+    def try_acquire(self) -> bool:
+        """
+        Claim a slot without waiting, so requests over the limit are rejected rather than queued.
+        """
+        return self._semaphore.acquire(blocking=False)
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+def _too_many_requests(message: str, retry_after: float):
+    return {"error": message}, 429, {"Retry-After": str(max(1, math.ceil(retry_after)))}
+
+
+def remote_addr_key() -> str:
+    """
+    Identify the client by its remote address.
+    Behind a reverse proxy this is the proxy's address unless the app is wrapped in ProxyFix.
+    """
+    return request.remote_addr or "unknown"
+
+
+def admission_control(rate_limiter: Optional[RateLimiter] = None,
+                      concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+                      key_func: Callable[[], str] = remote_addr_key):
+    """
+    Decorator for resource methods that applies an endpoint concurrency limit and then a per-client rate limit.
+    Rejected requests get 429 with a Retry-After header.
+
+    The concurrency slot is claimed first so that requests turned away because the server is busy
+    do not use up the client's rate limit tokens.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if concurrency_limiter is not None and not concurrency_limiter.try_acquire():
+                logging.warning(f"Concurrency limit reached on {concurrency_limiter.name}")
+                return _too_many_requests("Server is busy, please retry", concurrency_limiter.retry_after)
+
+            try:
+                if rate_limiter is not None:
+                    client_id = key_func()
+                    retry_after = rate_limiter.check(client_id)
+                    if retry_after > 0:
+                        logging.warning(f"Rate limit exceeded on {rate_limiter.name} for {client_id}")
+                        return _too_many_requests("Rate limit exceeded", retry_after)
+
+                return func(*args, **kwargs)
+            finally:
+                if concurrency_limiter is not None:
+                    concurrency_limiter.release()
+        return wrapper
+    return decorator
@@ -1,128 +1,171 @@
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Image, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import mm
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+from reportlab.lib.units import mm, inch
+rl_config.useA85 = 0  # Store streams as raw Flate data rather than ASCII85 text, which is ~25% larger
+from matplotlib.figure import Figure
+from PIL import Image as PILImage
 import io
 from datetime import datetime
 
+# Graph figures are rendered at this size and scaled to the draw size on the page
+FIGURE_SIZE = (8, 4)
+GRAPH_DRAW_WIDTH = 180*mm
+GRAPH_DRAW_HEIGHT = 100*mm
+
+# Default output renders graphs at a fixed DPI regardless of draw size
+DEFAULT_GRAPH_DPI = 300
+
+# Size-optimized output targets this resolution at the draw size, using a reduced palette
+OPTIMIZED_TARGET_DPI = 150
+OPTIMIZED_PALETTE_COLOURS = 64
+
+# Styles are shared by every report rather than rebuilt per table
+PARAGRAPH_STYLES = getSampleStyleSheet()
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+DETAIL_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 3),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('FONTSIZE', (0, 1), (-1, -1), 7),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
 class ReportGenerator:
     @staticmethod
-    def create_pdf_report(energy_data, daily_imbalance, highest_imbalance_hour):
+    def graph_dpi(optimize_size=False):
+        """
+        Get the DPI to render graph figures at.
+
+        Size-optimized output picks the DPI so that the rendered figure has
+        OPTIMIZED_TARGET_DPI once scaled to GRAPH_DRAW_WIDTH on the page.
+        """
+        if not optimize_size:
+            return DEFAULT_GRAPH_DPI
+        draw_width_inches = GRAPH_DRAW_WIDTH / inch
+        return OPTIMIZED_TARGET_DPI * draw_width_inches / FIGURE_SIZE[0]
+
+    @staticmethod
+    def _figure_to_image(fig, optimize_size=False):
+        img_buffer = io.BytesIO()
+        fig.savefig(img_buffer, format='png', dpi=ReportGenerator.graph_dpi(optimize_size))
+        img_buffer.seek(0)
+
+        if optimize_size:
+            # Graphs use few colours, so reducing the palette lets the embedded image data compress far better
+            with PILImage.open(img_buffer) as rendered:
+                indexed = rendered.convert('RGB').quantize(colors=OPTIMIZED_PALETTE_COLOURS)
+            img_buffer = io.BytesIO()
+            indexed.save(img_buffer, format='png', optimize=True)
+            img_buffer.seek(0)
+
+        img = Image(img_buffer)
+        img.drawHeight = GRAPH_DRAW_HEIGHT
+        img.drawWidth = GRAPH_DRAW_WIDTH
+        return img
+
+    @staticmethod
+    def create_pdf_report(energy_data, daily_imbalance, highest_imbalance_hour, optimize_size=False):
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=10*mm, leftMargin=10*mm, topMargin=10*mm, bottomMargin=10*mm)
         elements = []
 
-        styles = getSampleStyleSheet()
-        
         # First Page
-        elements.append(Paragraph("Energy Data Report", styles['Title']))
+        elements.append(Paragraph("Energy Data Report", PARAGRAPH_STYLES['Title']))
         elements.append(Spacer(1, 6*mm))
 
         # Summary sentence
         summary = f"This report presents energy imbalance data for {daily_imbalance['date']}, sourced from the Elexon BMRS API. It includes daily imbalance costs, hourly imbalance volumes, and detailed settlement period data."
-        elements.append(Paragraph(summary, styles['Normal']))
+        elements.append(Paragraph(summary, PARAGRAPH_STYLES['Normal']))
         elements.append(Spacer(1, 6*mm))
 
         # Daily Imbalance
-        elements.append(Paragraph("Daily Imbalance", styles['Heading2']))
+        elements.append(Paragraph("Daily Imbalance", PARAGRAPH_STYLES['Heading2']))
         data = [
             ['Date', 'Total Cost', 'Unit Rate'],
             [daily_imbalance['date'], f"£{daily_imbalance['total_daily_imbalance_cost']:.2f}", f"£{daily_imbalance['daily_imbalance_unit_rate']:.2f}/MWh"]
         ]
         t = Table(data, colWidths=[60*mm, 60*mm, 60*mm])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        t.setStyle(SUMMARY_TABLE_STYLE)
         elements.append(t)
         elements.append(Spacer(1, 6*mm))
 
         # Highest Imbalance Hour
-        elements.append(Paragraph("Highest Imbalance Hour", styles['Heading2']))
+        elements.append(Paragraph("Highest Imbalance Hour", PARAGRAPH_STYLES['Heading2']))
         data = [
             ['Date', 'Hour', 'Volume'],
             [highest_imbalance_hour['date'], f"{highest_imbalance_hour['highest_imbalance_hour']}:00", f"{highest_imbalance_hour['highest_imbalance_volume']:.2f} MWh"]
         ]
         t = Table(data, colWidths=[60*mm, 60*mm, 60*mm])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        t.setStyle(SUMMARY_TABLE_STYLE)
         elements.append(t)
 
         # Page break after first page
         elements.append(PageBreak())
 
         # Second Page - Graphs
-        elements.append(Paragraph("Energy Imbalance Graphs", styles['Heading1']))
+        elements.append(Paragraph("Energy Imbalance Graphs", PARAGRAPH_STYLES['Heading1']))
         elements.append(Spacer(1, 6*mm))
 
+        # Graphs are drawn on standalone Figures rather than through pyplot's shared state,
+        # so concurrent report renders cannot draw onto each other's figures
         # Net Imbalance Volume Graph
-        plt.figure(figsize=(8, 4))
+        fig = Figure(figsize=FIGURE_SIZE)
+        ax = fig.subplots()
         settlement_periods = [point.settlement_period for point in energy_data.data_points]
         net_imbalance_volumes = [point.net_imbalance_volume for point in energy_data.data_points]
         
-        plt.plot(settlement_periods, net_imbalance_volumes)
-        plt.title('Net Imbalance Volume Over Settlement Periods')
-        plt.xlabel('Settlement Period')
-        plt.ylabel('Net Imbalance Volume (MWh)')
-        plt.xticks(range(0, 49, 4))  # Show every 4th settlement period
-        plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-        plt.tight_layout()
+        ax.plot(settlement_periods, net_imbalance_volumes)
+        ax.set_title('Net Imbalance Volume Over Settlement Periods')
+        ax.set_xlabel('Settlement Period')
+        ax.set_ylabel('Net Imbalance Volume (MWh)')
+        ax.set_xticks(range(0, 49, 4))  # Show every 4th settlement period
+        ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+        fig.tight_layout()
 
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=300)
-        img_buffer.seek(0)
-        img = Image(img_buffer)
-        img.drawHeight = 100*mm
-        img.drawWidth = 180*mm
-        elements.append(img)
+        elements.append(ReportGenerator._figure_to_image(fig, optimize_size))
         elements.append(Spacer(1, 6*mm))
 
         # Hourly Imbalance Graph
-        plt.figure(figsize=(8, 4))
+        fig = Figure(figsize=FIGURE_SIZE)
+        ax = fig.subplots()
         hourly_imbalance = [0] * 24
         for point in energy_data.data_points:
             hour = datetime.fromisoformat(point.start_time.rstrip('Z')).hour
             hourly_imbalance[hour] += abs(point.net_imbalance_volume)
         
-        plt.bar(range(24), hourly_imbalance)
-        plt.title('Hourly Absolute Imbalance Volume')
-        plt.xlabel('Hour')
-        plt.ylabel('Absolute Imbalance Volume (MWh)')
-        plt.xticks(range(0, 24, 2))
-        plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-        plt.tight_layout()
+        ax.bar(range(24), hourly_imbalance)
+        ax.set_title('Hourly Absolute Imbalance Volume')
+        ax.set_xlabel('Hour')
+        ax.set_ylabel('Absolute Imbalance Volume (MWh)')
+        ax.set_xticks(range(0, 24, 2))
+        ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+        fig.tight_layout()
 
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=300)
-        img_buffer.seek(0)
-        img = Image(img_buffer)
-        img.drawHeight = 100*mm
-        img.drawWidth = 180*mm
-        elements.append(img)
+        elements.append(ReportGenerator._figure_to_image(fig, optimize_size))
 
         # Page break after graphs
         elements.append(PageBreak())
 
         # Third Page and onwards - Detailed Energy Data
-        elements.append(Paragraph("Detailed Energy Data", styles['Heading1']))
+        elements.append(Paragraph("Detailed Energy Data", PARAGRAPH_STYLES['Heading1']))
         elements.append(Spacer(1, 6*mm))
 
         data = [['Period', 'Start Time', 'System Sell Price (£)', 'System Buy Price (£)', 'Net Imbalance Volume (MWh)']]
@@ -136,17 +179,7 @@ class ReportGenerator:
             ])
         
         t = Table(data, colWidths=[20*mm, 40*mm, 40*mm, 40*mm, 40*mm])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 3),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('FONTSIZE', (0, 1), (-1, -1), 7),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        t.setStyle(DETAIL_TABLE_STYLE)
         elements.append(t)
 
         # Build the PDF
@@ -9,6 +9,7 @@ sys.path.insert(0, str(src_dir))
 
 import pytest
 from api import app as flask_app
+from api.rate_limiting import InMemoryRateLimitStore, get_rate_limit_store, set_rate_limit_store
 
 # Provide the Flask app instance for tests
 @pytest.fixture
@@ -24,4 +25,13 @@ def app_context(app):
 # Provide a test client to simulate HTTP requests
 @pytest.fixture
 def client(app):
-    return app.test_client()
\ No newline at end of file
+    return app.test_client()
+
+# Give each test fresh rate limit buckets, since the endpoint limiters are module-level
+@pytest.fixture(autouse=True)
+def rate_limit_store():
+    previous_store = get_rate_limit_store()
+    store = InMemoryRateLimitStore()
+    set_rate_limit_store(store)
+    yield store
+    set_rate_limit_store(previous_store)
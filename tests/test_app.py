@@ -1,6 +1,54 @@
+import io
 import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from api.data_objects import EnergyDataObject, EnergyDataPoint
 
 def test_index(client):
     response = client.get('/')
     assert response.status_code == 200
     assert response.data == b"Server is running"
+
+
+@patch("api.endpoints.ElexonBrmsFetcher.fetch_energy_data", return_value=None)
+def test_energy_report_rate_limited(mock_fetch, client):
+    # The configured burst for /energy_report is 3 reports per client
+    for _ in range(3):
+        assert client.get('/energy_report').status_code == 404
+
+    response = client.get('/energy_report')
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "20"
+    assert mock_fetch.call_count == 3
+
+    # Cheap endpoints have their own buckets and are unaffected
+    assert client.get('/daily_imbalance').status_code == 404
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("?optimize_size=true", True),
+    ("", False),
+])
+@patch("api.endpoints.ReportGenerator.create_pdf_report")
+@patch("api.endpoints.ElexonBrmsFetcher.fetch_energy_data")
+def test_energy_report_optimize_size_flag(mock_fetch, mock_create_pdf, client, query, expected):
+    start_time = datetime(2023, 5, 1)
+    mock_fetch.return_value = EnergyDataObject(
+        settlement_date="2023-05-01",
+        data_points=[
+            EnergyDataPoint(
+                settlement_period=i,
+                start_time=(start_time + timedelta(minutes=30 * (i - 1))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                system_sell_price=50.0,
+                system_buy_price=60.0,
+                net_imbalance_volume=100.0
+            )
+            for i in range(1, 49)
+        ]
+    )
+    mock_create_pdf.return_value = io.BytesIO(b"%PDF-1.4")
+
+    response = client.get(f'/energy_report{query}')
+
+    assert response.status_code == 200
+    assert mock_create_pdf.call_args.kwargs["optimize_size"] is expected
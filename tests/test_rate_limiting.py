@@ -0,0 +1,164 @@
+import pytest
+from flask import Flask, request
+from flask_restful import Api, Resource
+from api.rate_limiting import (InMemoryRateLimitStore, RateLimiter, ConcurrencyLimiter, admission_control,
+                               get_rate_limit_store, set_rate_limit_store)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(clock):
+    # Swap in an isolated store so buckets do not leak between tests
+    previous_store = get_rate_limit_store()
+    store = InMemoryRateLimitStore(clock=clock)
+    set_rate_limit_store(store)
+    yield store
+    set_rate_limit_store(previous_store)
+
+
+@pytest.fixture
+def report_concurrency():
+    return ConcurrencyLimiter("report", max_concurrent=1, retry_after=5)
+
+
+@pytest.fixture
+def limited_client(store, report_concurrency):
+    # A small app with one cheap and one expensive resource
+    class Cheap(Resource):
+        method_decorators = [admission_control(RateLimiter("cheap", capacity=2, refill_per_second=1.0),
+                                               ConcurrencyLimiter("cheap", max_concurrent=4))]
+
+        def get(self):
+            return {"status": "ok"}
+
+    class Report(Resource):
+        method_decorators = [admission_control(RateLimiter("report", capacity=5, refill_per_second=0.1),
+                                               report_concurrency)]
+
+        def get(self):
+            return {"status": "ok"}
+
+    app = Flask(__name__)
+    api = Api(app)
+    api.add_resource(Cheap, '/cheap')
+    api.add_resource(Report, '/report')
+    return app.test_client()
+
+
+def test_token_bucket_allows_burst_then_limits(store, clock):
+    assert store.consume("client", capacity=2, refill_per_second=0.5) == 0.0
+    assert store.consume("client", capacity=2, refill_per_second=0.5) == 0.0
+
+    retry_after = store.consume("client", capacity=2, refill_per_second=0.5)
+    assert pytest.approx(retry_after, 0.01) == 2.0
+
+    clock.now += 2.0
+    assert store.consume("client", capacity=2, refill_per_second=0.5) == 0.0
+
+
+def test_token_bucket_is_per_key(store):
+    assert store.consume("client_a", capacity=1, refill_per_second=1.0) == 0.0
+    assert store.consume("client_a", capacity=1, refill_per_second=1.0) > 0
+    assert store.consume("client_b", capacity=1, refill_per_second=1.0) == 0.0
+
+
+def test_refilled_buckets_are_swept(clock):
+    store = InMemoryRateLimitStore(clock=clock, sweep_interval=10.0)
+    for i in range(1000):
+        store.consume(f"client_{i}", capacity=2, refill_per_second=1.0)
+    assert len(store) == 1000
+
+    # Every bucket is full again after one second, so the next sweep drops all but the new one
+    clock.now += 10.0
+    store.consume("client_new", capacity=2, refill_per_second=1.0)
+    assert len(store) == 1
+
+
+def test_sweep_keeps_buckets_still_refilling(clock):
+    store = InMemoryRateLimitStore(clock=clock, sweep_interval=10.0)
+    for _ in range(5):
+        store.consume("heavy_client", capacity=5, refill_per_second=0.1)
+
+    clock.now += 10.0
+    store.consume("client_new", capacity=5, refill_per_second=0.1)
+    assert len(store) == 2
+    assert store.consume("heavy_client", capacity=5, refill_per_second=0.1) == 0.0
+    assert store.consume("heavy_client", capacity=5, refill_per_second=0.1) > 0
+
+
+def test_concurrency_limiter_rejects_when_full():
+    limiter = ConcurrencyLimiter("test", max_concurrent=1)
+
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    limiter.release()
+    assert limiter.try_acquire()
+
+
+def test_rate_limited_request_gets_429_with_retry_after(limited_client):
+    assert limited_client.get('/cheap').status_code == 200
+    assert limited_client.get('/cheap').status_code == 200
+
+    response = limited_client.get('/cheap')
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_busy_report_does_not_block_cheap_endpoint(limited_client, report_concurrency):
+    # Simulate a report render holding the only report slot
+    assert report_concurrency.try_acquire()
+    try:
+        response = limited_client.get('/report')
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "5"
+
+        assert limited_client.get('/cheap').status_code == 200
+    finally:
+        report_concurrency.release()
+
+    assert limited_client.get('/report').status_code == 200
+
+
+def test_busy_429_does_not_cost_rate_limit_token(limited_client, report_concurrency):
+    assert report_concurrency.try_acquire()
+    try:
+        # Far more busy rejections than the report bucket's capacity of 5
+        for _ in range(10):
+            assert limited_client.get('/report').status_code == 429
+    finally:
+        report_concurrency.release()
+
+    for _ in range(5):
+        assert limited_client.get('/report').status_code == 200
+
+
+def test_key_func_sets_client_identity(store):
+    client_header = "X-Client-Id"
+
+    class Keyed(Resource):
+        method_decorators = [admission_control(RateLimiter("keyed", capacity=1, refill_per_second=0.1),
+                                               key_func=lambda: request.headers.get(client_header, "unknown"))]
+
+        def get(self):
+            return {"status": "ok"}
+
+    app = Flask(__name__)
+    Api(app).add_resource(Keyed, '/keyed')
+    client = app.test_client()
+
+    assert client.get('/keyed', headers={client_header: "a"}).status_code == 200
+    assert client.get('/keyed', headers={client_header: "a"}).status_code == 429
+    assert client.get('/keyed', headers={client_header: "b"}).status_code == 200
@@ -0,0 +1,75 @@
+import pytest
+import time
+from datetime import datetime, timedelta
+from reportlab.lib.units import inch
+from api.data_objects import EnergyDataObject, EnergyDataPoint
+from api.report_generation import ReportGenerator, GRAPH_DRAW_WIDTH, FIGURE_SIZE, OPTIMIZED_TARGET_DPI
+
+# Budgets for a full day (48 settlement periods) size-optimized report
+OPTIMIZED_REPORT_MAX_BYTES = 130_000
+OPTIMIZED_REPORT_MAX_SECONDS = 5.0
+
+
+@pytest.fixture
+def full_day_energy_data():
+    start_time = datetime(2023, 5, 1)
+    return EnergyDataObject(
+        settlement_date="2023-05-01",
+        data_points=[
+            EnergyDataPoint(
+                settlement_period=i,
+                start_time=(start_time + timedelta(minutes=30 * (i - 1))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                system_sell_price=50.0 + i,
+                system_buy_price=60.0 + i,
+                net_imbalance_volume=(-1) ** i * 100.0 + i
+            )
+            for i in range(1, 49)
+        ]
+    )
+
+
+@pytest.fixture
+def report_summaries():
+    daily_imbalance = {
+        "date": "2023-05-01",
+        "total_daily_imbalance_cost": 1680.0,
+        "daily_imbalance_unit_rate": 14.0
+    }
+    highest_imbalance_hour = {
+        "date": "2023-05-01",
+        "highest_imbalance_hour": 0,
+        "highest_imbalance_volume": 80.0
+    }
+    return daily_imbalance, highest_imbalance_hour
+
+
+def test_graph_dpi_matches_draw_size():
+    dpi = ReportGenerator.graph_dpi(optimize_size=True)
+
+    # Rendered pixel width divided by the width drawn on the page gives the target DPI
+    assert pytest.approx(FIGURE_SIZE[0] * dpi / (GRAPH_DRAW_WIDTH / inch), 0.01) == OPTIMIZED_TARGET_DPI
+
+
+def test_optimized_report_within_budgets(full_day_energy_data, report_summaries):
+    daily_imbalance, highest_imbalance_hour = report_summaries
+
+    start = time.perf_counter()
+    pdf_buffer = ReportGenerator.create_pdf_report(full_day_energy_data, daily_imbalance, highest_imbalance_hour,
+                                                   optimize_size=True)
+    elapsed = time.perf_counter() - start
+    pdf_bytes = pdf_buffer.getvalue()
+
+    assert pdf_bytes.startswith(b"%PDF")
+    assert b"ASCII85Decode" not in pdf_bytes
+    assert len(pdf_bytes) <= OPTIMIZED_REPORT_MAX_BYTES
+    assert elapsed <= OPTIMIZED_REPORT_MAX_SECONDS
+
+
+def test_optimized_report_smaller_than_default(full_day_energy_data, report_summaries):
+    daily_imbalance, highest_imbalance_hour = report_summaries
+
+    default_pdf = ReportGenerator.create_pdf_report(full_day_energy_data, daily_imbalance, highest_imbalance_hour)
+    optimized_pdf = ReportGenerator.create_pdf_report(full_day_energy_data, daily_imbalance, highest_imbalance_hour,
+                                                      optimize_size=True)
+
+    assert len(optimized_pdf.getvalue()) < len(default_pdf.getvalue())